@@ -0,0 +1,29 @@
+#!/usr/bin/env python3
+"""
+Pre-warm the tiktoken BPE cache.
+
+tiktoken downloads BPE files over the network on first use (~500 ms cold
+start, and a hard failure offline). Run this once — e.g. in a Docker build
+step or CI setup — to bake the files into data/tiktoken_cache, which
+src/common/tokenizer.py points tiktoken at automatically.
+
+Usage:
+  python scripts/load_tiktoken.py
+"""
+import os
+from pathlib import Path
+
+CACHE_DIR = Path(__file__).resolve().parents[1] / "data" / "tiktoken_cache"
+
+def main():
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    os.environ.setdefault("TIKTOKEN_CACHE_DIR", str(CACHE_DIR))
+
+    import tiktoken
+    for name in ("cl100k_base", "o200k_base"):
+        tiktoken.get_encoding(name)
+        print(f"[OK] Cached {name}")
+    print(f"[OK] BPE cache ready at {CACHE_DIR}/")
+
+if __name__ == "__main__":
+    main()
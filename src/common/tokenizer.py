@@ -0,0 +1,24 @@
+"""
+Shared tiktoken helper.
+
+`tiktoken.get_encoding` costs ~100-300 ms the first time it runs, so every
+module that tokenizes should go through this cached accessor instead of
+instantiating its own encoder.
+"""
+import os
+from functools import lru_cache
+from pathlib import Path
+
+# Point tiktoken at the baked BPE cache (see scripts/load_tiktoken.py) so
+# startup reads from disk instead of fetching over the network.
+_BPE_CACHE_DIR = Path(__file__).resolve().parents[2] / "data" / "tiktoken_cache"
+if _BPE_CACHE_DIR.is_dir():
+    os.environ.setdefault("TIKTOKEN_CACHE_DIR", str(_BPE_CACHE_DIR))
+
+import tiktoken
+
+
+@lru_cache(maxsize=8)
+def get_encoding(name: str = "cl100k_base"):
+    """Return a (cached) tiktoken encoding by name."""
+    return tiktoken.get_encoding(name)
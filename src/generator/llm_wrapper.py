@@ -1,7 +1,11 @@
 from dotenv import load_dotenv
+import asyncio
+import hashlib
 import os
 import sys
+from collections import OrderedDict
 from pathlib import Path
+from typing import List, Optional
 
 # -------------------------------------------------------------------
 # Load environment variables from .env in project root (safe default)
@@ -51,6 +55,10 @@ class LLM:
         self.model_name = model_name
         self.temperature = temperature
         self.max_tokens = max_tokens
+        # prompt -> response cache (LRU); identical RAG prompts recur often,
+        # and a hit skips the provider round-trip entirely
+        self._cache: OrderedDict = OrderedDict()
+        self._cache_max = 1024
 
         if self.mode == "hf":
             try:
@@ -82,22 +90,58 @@ class LLM:
                     raise RuntimeError("OPENAI_API_KEY not set. Cannot use OpenAI.")
                 self.openai = openai
                 self.openai.api_key = OPENAI_API_KEY
+                # async client for concurrent generation (openai>=1.0)
+                self.async_openai = openai.AsyncOpenAI(api_key=OPENAI_API_KEY) if hasattr(openai, "AsyncOpenAI") else None
             except ImportError:
                 raise ImportError("OpenAI requires 'openai'. Install: pip install openai")
 
         else:
             raise ValueError("Unsupported mode. Choose from: 'hf', 'gemini', 'openai'.")
 
+    def _cache_key(self, prompt: str) -> Optional[str]:
+        # Only deterministic outputs are cacheable; skip when sampling.
+        if self.temperature > 0:
+            return None
+        return hashlib.blake2b(prompt.encode("utf-8")).hexdigest()
+
+    def _cache_get(self, key: Optional[str]) -> Optional[str]:
+        if key is None:
+            return None
+        answer = self._cache.get(key)
+        if answer is not None:
+            self._cache.move_to_end(key)
+        return answer
+
+    def _cache_put(self, key: Optional[str], answer: str):
+        # Don't cache error strings, they should be retried next time
+        if key is None or answer.startswith(f"[{self.mode.upper()} ERROR]"):
+            return
+        self._cache[key] = answer
+        if len(self._cache) > self._cache_max:
+            self._cache.popitem(last=False)
+
     def generate(self, prompt: str) -> str:
         """
         Generate text from the model.
 
+        Responses for deterministic settings (temperature == 0) are cached
+        by prompt hash, so a repeated prompt costs no network round-trip.
+
         Args:
             prompt (str): Input query.
 
         Returns:
             str: Model output.
         """
+        key = self._cache_key(prompt)
+        cached = self._cache_get(key)
+        if cached is not None:
+            return cached
+        answer = self._generate(prompt)
+        self._cache_put(key, answer)
+        return answer
+
+    def _generate(self, prompt: str) -> str:
         try:
             if self.mode == "hf":
                 outputs = self.pipe(prompt, max_new_tokens=self.max_tokens, do_sample=False)
@@ -119,6 +163,73 @@ class LLM:
         except Exception as e:
             return f"[{self.mode.upper()} ERROR] {e}"
 
+    async def agenerate(self, prompt: str) -> str:
+        """
+        Async variant of `generate`.
+
+        Args:
+            prompt (str): Input query.
+
+        Returns:
+            str: Model output.
+        """
+        key = self._cache_key(prompt)
+        cached = self._cache_get(key)
+        if cached is not None:
+            return cached
+        answer = await self._agenerate(prompt)
+        self._cache_put(key, answer)
+        return answer
+
+    async def _agenerate(self, prompt: str) -> str:
+        try:
+            if self.mode == "gemini":
+                resp = await self.gen_model.generate_content_async(prompt)
+                return resp.text.strip() if resp and resp.text else "[Empty Gemini response]"
+
+            elif self.mode == "openai" and self.async_openai is not None:
+                resp = await self.async_openai.chat.completions.create(
+                    model=self.model_name,
+                    messages=[{"role": "user", "content": prompt}],
+                    temperature=self.temperature,
+                    max_tokens=self.max_tokens
+                )
+                return resp.choices[0].message.content.strip()
+
+            # hf (and openai<1.0) have no async API -> run the sync path in a thread
+            return await asyncio.to_thread(self._generate, prompt)
+
+        except Exception as e:
+            return f"[{self.mode.upper()} ERROR] {e}"
+
+    async def agenerate_many(self, prompts: List[str], concurrency: int = 32) -> List[str]:
+        """
+        Generate answers for many prompts concurrently.
+
+        Requests are fired with asyncio.gather so network round-trips overlap;
+        a semaphore caps the number of inflight API calls.
+
+        Args:
+            prompts (List[str]): Input prompts.
+            concurrency (int): Max number of concurrent requests.
+
+        Returns:
+            List[str]: Model outputs, in the same order as `prompts`.
+        """
+        sem = asyncio.Semaphore(concurrency)
+
+        async def _one(prompt: str) -> str:
+            async with sem:
+                return await self.agenerate(prompt)
+
+        return await asyncio.gather(*[_one(p) for p in prompts])
+
+    def generate_many(self, prompts: List[str], concurrency: int = 32) -> List[str]:
+        """
+        Sync convenience wrapper around `agenerate_many`.
+        """
+        return asyncio.run(self.agenerate_many(prompts, concurrency=concurrency))
+
 
 # -------------------------------------------------------------------
 # Example usage
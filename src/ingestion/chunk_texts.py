@@ -1,30 +1,33 @@
 
 import argparse
 import csv
-import json
 from pathlib import Path
-from typing import Iterator
+from typing import List
 
-import tiktoken
+import pyarrow as pa
+import pyarrow.parquet as pq
 from tqdm import tqdm
 
+from src.common.tokenizer import get_encoding
+
 PROC_INDEX = Path("data/processed/index.csv")
-CHUNK_DIR = Path("data/chunks")
-CHUNK_DIR.mkdir(parents=True, exist_ok=True)
+CHUNK_FILE = Path("data/chunks.parquet")
+CHUNK_FILE.parent.mkdir(parents=True, exist_ok=True)
 
 def iter_rows():
     with open(PROC_INDEX, newline="", encoding="utf-8") as f:
         for row in csv.DictReader(f):
             yield row
 
-def chunk_by_tokens(text: str, chunk_size: int, overlap: int, enc) -> Iterator[tuple[int, int, str]]:
+def chunk_by_tokens(text: str, chunk_size: int, overlap: int, enc) -> List[tuple[int, int, str]]:
+    # Encode once, then decode all sliding windows in a single batch call
+    # (one C-level call instead of one decode per chunk).
     tokens = enc.encode(text)
     step = chunk_size - overlap
-    i = 0
-    while i < len(tokens):
-        window = tokens[i:i + chunk_size]
-        yield i, i + len(window), enc.decode(window)
-        i += step
+    offsets = list(range(0, len(tokens), step))
+    windows = [tokens[i:i + chunk_size] for i in offsets]
+    texts = enc.decode_batch(windows)
+    return [(i, i + len(w), t) for i, w, t in zip(offsets, windows, texts)]
 
 def main():
     parser = argparse.ArgumentParser()
@@ -32,32 +35,31 @@ def main():
     parser.add_argument("--overlap", type=int, default=150)
     args = parser.parse_args()
 
-    enc = tiktoken.get_encoding("cl100k_base")
-    total_chunks = 0
+    enc = get_encoding("cl100k_base")
+
+    # Columnar accumulation: one Parquet file for the whole corpus instead of
+    # a JSONL per paper, so downstream readers skip per-line JSON parsing.
+    cols = {"chunk_id": [], "arxiv_id": [], "title": [],
+            "start_token": [], "end_token": [], "text": []}
 
-    for row in tqdm(list(iter_rows()), desc="Chunking"):
+    # Count rows cheaply for tqdm's total instead of materializing the index
+    n_rows = max(sum(1 for _ in open(PROC_INDEX, encoding="utf-8")) - 1, 0)
+    for row in tqdm(iter_rows(), total=n_rows, desc="Chunking"):
         text_path = Path(row["text_path"])
         if not text_path.exists():
             continue
         text = text_path.read_text(encoding="utf-8")
-        out_path = CHUNK_DIR / f"{row['arxiv_id']}.jsonl"
-
-        with out_path.open("w", encoding="utf-8") as f:
-            cid = 0
-            for start, end, chunk_text in chunk_by_tokens(text, args.chunk_size, args.overlap, enc):
-                rec = {
-                    "chunk_id": cid,
-                    "arxiv_id": row["arxiv_id"],
-                    "title": row["title"],
-                    "start_token": start,
-                    "end_token": end,
-                    "text": chunk_text
-                }
-                f.write(json.dumps(rec, ensure_ascii=False) + "\n")
-                cid += 1
-                total_chunks += 1
-
-    print(f"[OK] Wrote {total_chunks} chunks to {CHUNK_DIR}/")
+        for cid, (start, end, chunk_text) in enumerate(
+                chunk_by_tokens(text, args.chunk_size, args.overlap, enc)):
+            cols["chunk_id"].append(cid)
+            cols["arxiv_id"].append(row["arxiv_id"])
+            cols["title"].append(row["title"])
+            cols["start_token"].append(start)
+            cols["end_token"].append(end)
+            cols["text"].append(chunk_text)
+
+    pq.write_table(pa.table(cols), CHUNK_FILE, compression="zstd")
+    print(f"[OK] Wrote {len(cols['text'])} chunks to {CHUNK_FILE}")
 
 if __name__ == "__main__":
     main()
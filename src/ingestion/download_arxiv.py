@@ -1,10 +1,12 @@
 
 import argparse
+import asyncio
 import csv
 import os
 from pathlib import Path
 from typing import List
 
+import aiohttp
 import arxiv
 from slugify import slugify
 from tqdm import tqdm
@@ -18,6 +20,40 @@ def sanitize_filename(title: str, arxiv_id: str) -> str:
     base = slugify(title)[:80]  # limit length
     return f"{base}-{arxiv_id}.pdf"
 
+async def fetch_pdf(session: aiohttp.ClientSession, sem: asyncio.Semaphore,
+                    arxiv_id: str, url: str, path: Path, max_retries: int = 3) -> bool:
+    # Stream into a .part file and rename only once the transfer completes,
+    # so an interrupted download never leaves a truncated PDF at the final
+    # path (which would be treated as a success and never re-fetched).
+    part_path = path.with_suffix(".part")
+    async with sem:
+        for attempt in range(max_retries):
+            try:
+                async with session.get(url) as resp:
+                    if resp.status == 429:
+                        # rate limited: back off exponentially and retry
+                        await asyncio.sleep(2 ** attempt)
+                        continue
+                    resp.raise_for_status()
+                    with open(part_path, "wb") as f:
+                        async for chunk in resp.content.iter_chunked(64 * 1024):
+                            f.write(chunk)
+                    part_path.rename(path)
+                    return True
+            except Exception as e:
+                print(f"[WARN] Failed to download {arxiv_id}: {e}")
+                part_path.unlink(missing_ok=True)
+                return False
+        print(f"[WARN] Failed to download {arxiv_id}: rate limited after {max_retries} retries")
+        part_path.unlink(missing_ok=True)
+        return False
+
+async def fetch_all(downloads: List[tuple]) -> List[bool]:
+    sem = asyncio.Semaphore(5)
+    async with aiohttp.ClientSession() as session:
+        tasks = [fetch_pdf(session, sem, arxiv_id, url, path) for arxiv_id, url, path in downloads]
+        return await asyncio.gather(*tasks)
+
 def download_papers(query: str, max_results: int, categories_hint: str = "") -> List[dict]:
     search = arxiv.Search(
         query=query,
@@ -28,8 +64,11 @@ def download_papers(query: str, max_results: int, categories_hint: str = "") ->
 
     client = arxiv.Client(page_size=50, delay_seconds=3, num_retries=3)
     records = []
+    downloads = []  # (arxiv_id, pdf_url, path) for PDFs not yet on disk
 
-    for result in tqdm(client.results(search), total=max_results, desc="Downloading PDFs"):
+    # Metadata iteration stays synchronous (the arxiv client paginates);
+    # only the PDF fetches run concurrently below.
+    for result in tqdm(client.results(search), total=max_results, desc="Fetching metadata"):
         arxiv_id = result.get_short_id()
         title = result.title
         authors = ", ".join(a.name for a in result.authors)
@@ -38,11 +77,7 @@ def download_papers(query: str, max_results: int, categories_hint: str = "") ->
         pdf_path = RAW_DIR / filename
 
         if not pdf_path.exists():
-            try:
-                result.download_pdf(dirpath=str(RAW_DIR), filename=filename)
-            except Exception as e:
-                print(f"[WARN] Failed to download {arxiv_id}: {e}")
-                continue
+            downloads.append((arxiv_id, result.pdf_url, pdf_path))
 
         records.append({
             "arxiv_id": arxiv_id,
@@ -56,6 +91,12 @@ def download_papers(query: str, max_results: int, categories_hint: str = "") ->
             "entry_id": result.entry_id,
         })
 
+    if downloads:
+        print(f"[INFO] Downloading {len(downloads)} PDFs (max 5 concurrent)...")
+        asyncio.run(fetch_all(downloads))
+
+    # Drop records whose PDF never made it to disk
+    records = [r for r in records if Path(r["pdf_path"]).exists()]
     return records
 
 def write_metadata(rows: List[dict]):
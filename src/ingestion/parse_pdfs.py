@@ -1,8 +1,10 @@
 
 import csv
+import os
 import re
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, List, Optional
 
 import fitz  # PyMuPDF
 from tqdm import tqdm
@@ -20,53 +22,85 @@ def read_metadata() -> List[Dict]:
             rows.append(row)
     return rows
 
-def extract_text(pdf_path: Path) -> str:
-    doc = fitz.open(pdf_path)
-    pages = []
-    for page in doc:
-        text = page.get_text("text")
-        pages.append(text)
-    return "\n".join(pages)
+# Let MuPDF dehyphenate line breaks in C; clean_text no longer needs to
+_EXTRACT_FLAGS = fitz.TEXT_PRESERVE_LIGATURES | fitz.TEXT_DEHYPHENATE
+
+# Compiled once at import; clean_text runs over multi-MB paper bodies, so each
+# extra re.sub pass is a full copy of the text.
+_CLEAN = re.compile(r"[ \t]*\n+[ \t]*"   # newline runs (plus surrounding blanks)
+                    r"|[ \t]{2,}")        # runs of spaces/tabs
+_SHORT_LINE = re.compile(r"^.{0,2}$\n?", re.MULTILINE)
+_REFS = re.compile(r"\nreferences\b.*", re.IGNORECASE | re.DOTALL)
+
+def _clean_repl(m: re.Match) -> str:
+    return "\n" if "\n" in m.group(0) else " "
 
 def clean_text(text: str, trim_references: bool = True) -> str:
-    # 1) Merge hyphenated words across line-breaks: e.g., "gener-\native" -> "genernative"
-    text = re.sub(r"(\w)-\n(\w)", r"\1\2", text)
-    # 2) Replace newlines inside paragraphs with spaces, but keep paragraph breaks
-    text = re.sub(r"[ \t]+\n", "\n", text)
-    text = re.sub(r"\n{2,}", "\n\n", text)
-    text = re.sub(r"[ \t]{2,}", " ", text)
-    # 3) Remove lines that are too short or look like headers/footers noise
-    lines = [ln.strip() for ln in text.splitlines()]
-    lines = [ln for ln in lines if len(ln) > 2]
-    text = "\n".join(lines)
-    # 4) Optionally trim everything after a "References" section (heuristic)
+    # 1) One pass: normalize newline runs and collapse space runs
+    #    (extraction already dehyphenated line breaks via TEXT_DEHYPHENATE)
+    text = _CLEAN.sub(_clean_repl, text)
+    # 2) Remove lines that are too short (header/footer noise)
+    text = _SHORT_LINE.sub("", text)
+    # 3) Optionally trim everything after a "References" section (heuristic)
     if trim_references:
-        m = re.search(r"\nreferences\b.*", text, flags=re.IGNORECASE | re.DOTALL)
+        m = _REFS.search(text)
         if m:
             text = text[:m.start()]
     return text.strip()
 
+def parse_one(r: Dict) -> Optional[Dict]:
+    # Runs inside a worker process: fitz handles are not picklable, so the
+    # PDF must be opened here rather than in the parent.
+    pdf_path = Path(r["pdf_path"])
+    if not pdf_path.exists():
+        return None
+    out_file = PROC_DIR / f"{r['arxiv_id']}.txt"
+    try:
+        doc = fitz.open(pdf_path)
+        try:
+            # Stream page by page: extract, clean and write each page instead
+            # of holding raw + cleaned copies of the whole paper in memory.
+            num_chars = 0
+            with out_file.open("w", encoding="utf-8") as out:
+                for page in doc:
+                    cleaned = clean_text(page.get_text("text", flags=_EXTRACT_FLAGS),
+                                         trim_references=False)
+                    if not cleaned:
+                        continue
+                    # stop at the References heading rather than buffering the
+                    # full text just to trim it afterwards (\n-prefixed so a
+                    # heading at the top of a page also matches)
+                    m = _REFS.search("\n" + cleaned)
+                    if m:
+                        head = cleaned[:max(m.start() - 1, 0)].rstrip()
+                        if head:
+                            out.write(head + "\n")
+                            num_chars += len(head) + 1
+                        break
+                    out.write(cleaned + "\n")
+                    num_chars += len(cleaned) + 1
+        finally:
+            doc.close()
+        return {
+            "arxiv_id": r["arxiv_id"],
+            "title": r["title"],
+            "pdf_path": r["pdf_path"],
+            "text_path": str(out_file),
+            "num_chars": num_chars
+        }
+    except Exception as e:
+        print(f"[WARN] Failed to parse {pdf_path.name}: {e}")
+        return None
+
 def main():
     rows = read_metadata()
-    out_rows = []
-    for r in tqdm(rows, desc="Parsing PDFs"):
-        pdf_path = Path(r["pdf_path"])
-        if not pdf_path.exists():
-            continue
-        try:
-            raw = extract_text(pdf_path)
-            cleaned = clean_text(raw, trim_references=True)
-            out_file = PROC_DIR / f"{r['arxiv_id']}.txt"
-            out_file.write_text(cleaned, encoding="utf-8")
-            out_rows.append({
-                "arxiv_id": r["arxiv_id"],
-                "title": r["title"],
-                "pdf_path": r["pdf_path"],
-                "text_path": str(out_file),
-                "num_chars": len(cleaned)
-            })
-        except Exception as e:
-            print(f"[WARN] Failed to parse {pdf_path.name}: {e}")
+
+    # Parse one PDF per core: extraction releases the GIL in C and the
+    # regex cleaning is CPU-bound, so a process pool scales near-linearly.
+    with ProcessPoolExecutor(max_workers=os.cpu_count()) as ex:
+        results = list(tqdm(ex.map(parse_one, rows, chunksize=4),
+                            total=len(rows), desc="Parsing PDFs"))
+    out_rows = [r for r in results if r is not None]
 
     # index
     with open(PROC_INDEX, "w", newline="", encoding="utf-8") as f:
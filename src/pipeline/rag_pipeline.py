@@ -8,9 +8,11 @@ Usage (example):
   python src/pipeline/rag_pipeline.py --query "What is reinforcement learning?" --model openai
 """
 import argparse
-import tiktoken
 
-from src.pipeline.retriever import Retriever
+import numpy as np
+
+from src.common.tokenizer import get_encoding
+from src.pipeline.retriever import get_retriever
 from src.generator.llm_wrapper import LLM
 
 
@@ -26,23 +28,21 @@ def build_final_prompt(contexts, question):
     return prompt
 
 def select_contexts_by_token_budget(candidates, token_budget=3000, enc=None):
-    enc = enc or tiktoken.get_encoding("cl100k_base")
-    selected = []
-    used = 0
-    for c in candidates:
-        tok_len = len(enc.encode(c["text"]))
-        if used + tok_len > token_budget:
-            # if no contexts selected and single chunk > budget, still include it (avoid empty)
-            if not selected:
-                selected.append(c)
-            break
-        selected.append(c)
-        used += tok_len
-    return selected
+    enc = enc or get_encoding("cl100k_base")
+    if not candidates:
+        return []
+    # Tokenize all candidates in one batch call, then pick the longest prefix
+    # whose cumulative token count fits the budget.
+    encs = enc.encode_batch([c["text"] for c in candidates])
+    cum = np.cumsum([len(e) for e in encs])
+    k = int(np.searchsorted(cum, token_budget, side="right"))
+    # if the first chunk alone exceeds the budget, still include it (avoid empty)
+    return candidates[:max(k, 1)]
 
 def main():
     parser = argparse.ArgumentParser()
-    parser.add_argument("--query", required=True)
+    parser.add_argument("--query", required=True, action="append",
+                        help="Question to answer. Repeat the flag to batch several queries.")
     parser.add_argument("--top-k", type=int, default=8)
     parser.add_argument("--rerank", type=int, default=4)
     parser.add_argument("--model", choices=["openai", "hf", "gemini"], default="openai")
@@ -50,26 +50,33 @@ def main():
     parser.add_argument("--token-budget", type=int, default=3000)
     args = parser.parse_args()
 
-    # 1) retrieve + rerank
-    retr = Retriever()
-    candidates = retr.query(args.query, k=args.top_k, rerank_top_n=args.rerank)
-
-    # 2) select contexts under token budget
-    enc = tiktoken.get_encoding("cl100k_base")
-    contexts = select_contexts_by_token_budget(candidates, token_budget=args.token_budget, enc=enc)
+    # 1) retrieve + rerank all queries in one batched call, then select
+    #    contexts under token budget (per query)
+    retr = get_retriever()
+    enc = get_encoding("cl100k_base")
+    candidates_per_query = retr.query_many(args.query, k=args.top_k, rerank_top_n=args.rerank)
+    contexts_per_query = [
+        select_contexts_by_token_budget(candidates, token_budget=args.token_budget, enc=enc)
+        for candidates in candidates_per_query
+    ]
 
-    # 3) build prompt and call LLM
-    prompt = build_final_prompt(contexts, args.query)
+    # 2) build prompts and call LLM (concurrently when several queries were given)
+    prompts = [build_final_prompt(ctx, q) for ctx, q in zip(contexts_per_query, args.query)]
     llm = LLM(mode=args.model, model_name=args.model_name, temperature=0.0, max_tokens=512)
-    answer = llm.generate(prompt)
+    if len(prompts) > 1:
+        answers = llm.generate_many(prompts)
+    else:
+        answers = [llm.generate(prompts[0])]
 
-    # 4) print outputs (answer + which contexts used)
-    print("\n=== Answer ===\n")
-    print(answer)
-    print("\n=== Source passages used ===\n")
-    for i, c in enumerate(contexts):
-        print(f"[{i+1}] id: {c['id']}  meta: {c.get('metadata')}")
-        print(c['text'][:400].replace("\n", " "), "...\n" + "-"*60)
+    # 3) print outputs (answer + which contexts used)
+    for query, answer, contexts in zip(args.query, answers, contexts_per_query):
+        print(f"\n=== Query ===\n\n{query}")
+        print("\n=== Answer ===\n")
+        print(answer)
+        print("\n=== Source passages used ===\n")
+        for i, c in enumerate(contexts):
+            print(f"[{i+1}] id: {c['id']}  meta: {c.get('metadata')}")
+            print(c['text'][:400].replace("\n", " "), "...\n" + "-"*60)
 
 if __name__ == "__main__":
     main()
@@ -5,9 +5,12 @@ Usage (example):
   python src/pipeline/retriever.py --query "What is reinforcement learning?" --k 8 --rerank 5
 """
 import argparse
+from functools import lru_cache
 from typing import List, Dict
 
 import chromadb
+import numpy as np
+import torch
 from sentence_transformers import CrossEncoder
 
 class Retriever:
@@ -17,30 +20,81 @@ class Retriever:
         self.collection = self.client.get_collection(name=collection_name)
         # load cross-encoder for reranking (fast & small)
         self.reranker = CrossEncoder(reranker_model) if reranker_model else None
+        if self.reranker:
+            # inference-only: no autograd, and fp16 weights on GPU
+            self.reranker.model.eval()
+            torch.set_grad_enabled(False)
+            if torch.cuda.is_available():
+                self.reranker.model.half()
     
+    def _score(self, inputs: List[List[str]]):
+        # Sort pairs by passage length so each predict batch pads to similar
+        # lengths (less wasted compute), then restore the original order.
+        order = sorted(range(len(inputs)), key=lambda i: len(inputs[i][1]))
+        with torch.inference_mode():
+            if torch.cuda.is_available():
+                with torch.autocast(device_type="cuda", dtype=torch.float16):
+                    sorted_scores = self.reranker.predict([inputs[i] for i in order],
+                                                          batch_size=64, convert_to_numpy=True,
+                                                          show_progress_bar=False)
+            else:
+                sorted_scores = self.reranker.predict([inputs[i] for i in order],
+                                                      batch_size=64, convert_to_numpy=True,
+                                                      show_progress_bar=False)
+        scores = [0.0] * len(inputs)
+        for rank, i in enumerate(order):
+            scores[i] = sorted_scores[rank]
+        return scores
+
     def query(self, query: str, k: int = 10, rerank_top_n: int = 0) -> List[Dict]:
-    # raw dense retrieval
+        return self.query_many([query], k=k, rerank_top_n=rerank_top_n)[0]
+
+    def query_many(self, queries: List[str], k: int = 10, rerank_top_n: int = 0) -> List[List[Dict]]:
+        # raw dense retrieval; Chroma batches all queries in a single request
         results = self.collection.query(
-            query_texts=[query],
+            query_texts=queries,
             n_results=k,
             include=["documents", "metadatas"]  # ✅ removed "ids"
         )
-        ids = results["ids"][0]   # still works, ids are always returned
-        docs = results["documents"][0]
-        metas = results["metadatas"][0]
 
-        candidates = [{"id": ids[i], "text": docs[i], "metadata": metas[i]} for i in range(len(docs))]
+        per_query = []
+        for qi in range(len(queries)):
+            ids = results["ids"][qi]   # still works, ids are always returned
+            docs = results["documents"][qi]
+            metas = results["metadatas"][qi]
+            per_query.append([{"id": ids[i], "text": docs[i], "metadata": metas[i]}
+                              for i in range(len(docs))])
 
-        # optional rerank top-N using cross-encoder (higher score -> more relevant)
+        # optional rerank top-N using cross-encoder (higher score -> more relevant);
+        # pairs from all queries are flattened into one predict call, then re-split
         if rerank_top_n and self.reranker:
-            top_slice = candidates[:rerank_top_n]
-            inputs = [[query, c["text"]] for c in top_slice]
-            scores = self.reranker.predict(inputs)  # shape (rerank_top_n,)
-            for i, s in enumerate(scores):
-                top_slice[i]["score"] = float(s)
-            top_sorted = sorted(top_slice, key=lambda x: x["score"], reverse=True)
-            return top_sorted + candidates[rerank_top_n:]
-        return candidates
+            inputs = []
+            tops = []
+            for q, candidates in zip(queries, per_query):
+                top_slice = candidates[:rerank_top_n]
+                tops.append(top_slice)
+                inputs.extend([[q, c["text"]] for c in top_slice])
+            scores = np.asarray(self._score(inputs)) if inputs else np.empty(0)
+
+            reranked = []
+            pos = 0
+            for top_slice, candidates in zip(tops, per_query):
+                s = scores[pos:pos + len(top_slice)]
+                pos += len(top_slice)
+                # vectorized descending sort instead of sorted() over dicts
+                order = np.argsort(-s)
+                top_sorted = [top_slice[i] | {"score": float(s[i])} for i in order]
+                reranked.append(top_sorted + candidates[rerank_top_n:])
+            return reranked
+        return per_query
+
+
+@lru_cache(maxsize=1)
+def get_retriever(persist_dir: str = "data/chroma", collection_name: str = "arxiv-chunks",
+                  reranker_model: str = "cross-encoder/ms-marco-MiniLM-L-6-v2") -> Retriever:
+    """Cached Retriever so repeated queries reuse the Chroma client and cross-encoder."""
+    return Retriever(persist_dir=persist_dir, collection_name=collection_name,
+                     reranker_model=reranker_model)
 
 
 if __name__ == "__main__":